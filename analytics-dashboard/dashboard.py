@@ -1,10 +1,17 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.fs as pafs
+import pyarrow.json as pajson
+import pyarrow.parquet as pq
 from minio import Minio
 import os
 import io
-import json
-import matplotlib.pyplot as plt
+import codecs
+import warnings
+import orjson
+import altair as alt
 import numpy as np
 
 # ------------------ CONFIG ------------------
@@ -18,6 +25,14 @@ MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "minio:9000")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "minioadmin")
 
+PLOT_SAMPLE_SIZE = 50_000
+DEFAULT_COLUMN_COUNT = 20
+PREVIEW_MAX_ROWS = 100
+
+# Streamlit never deletes persisted cache entries, so the oldest are pruned past this size
+DISK_CACHE_DIR = os.path.expanduser("~/.streamlit/cache")
+DISK_CACHE_MAX_BYTES = int(os.getenv("DISK_CACHE_MAX_BYTES", 1_500_000_000))
+
 # ------------------ STYLING ------------------
 st.markdown("""
     <style>
@@ -45,41 +60,209 @@ def get_minio_client():
     )
 
 
+@st.cache_resource
+def get_arrow_filesystem():
+    # Seekable S3 access to MinIO, so Parquet reads fetch only the footer and selected columns
+    return pafs.S3FileSystem(
+        access_key=MINIO_ACCESS_KEY,
+        secret_key=MINIO_SECRET_KEY,
+        endpoint_override=MINIO_ENDPOINT,
+        scheme="http"
+    )
+
+
 client = get_minio_client()
 
 
 # ------------------ HELPERS ------------------
-def load_dataset(filename: str, raw: bytes) -> pd.DataFrame:
-    """Load dataset with robust error handling"""
+CSV_DELIMITERS = [",", "\t", ";", "|"]
+CSV_SNIFF_BYTES = 64 * 1024
+# pandas' default NA markers; Arrow only applies its own (shorter) list to non-string columns
+CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+]
+
+
+def sniff_csv_format(stream: io.BufferedReader):
+    """Detect delimiter and encoding from the leading bytes without consuming the stream"""
+    sample = stream.peek(CSV_SNIFF_BYTES)
+    try:
+        # Incremental decoder tolerates a multi-byte character cut off at the sample edge
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+        encoding = "utf-8"
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+
+    header = sample.split(b"\n", 1)[0]
+    for sep in CSV_DELIMITERS:
+        if sep.encode() in header:
+            return sep, encoding
+    return ",", encoding
+
+
+def csv_header(sample: bytes, sep: str, encoding: str):
+    """Column names from the header line, named the way pandas does ("Unnamed: 0", "a.1")"""
+    header = sample.split(b"\n", 1)[0] + b"\n"
+    return pd.read_csv(io.BytesIO(header), sep=sep, encoding=encoding, nrows=0).columns.tolist()
+
+
+@st.cache_data(ttl=30)
+def read_header(filename: str, etag: str):
+    """Read column names without loading the dataset, or None if the format needs a full parse"""
+    if filename.lower().endswith((".csv", ".tsv")):
+        response = client.get_object("input-data", filename, offset=0, length=CSV_SNIFF_BYTES)
+        try:
+            stream = io.BufferedReader(response, buffer_size=CSV_SNIFF_BYTES)
+            sep, encoding = sniff_csv_format(stream)
+            return csv_header(stream.peek(CSV_SNIFF_BYTES), sep, encoding)
+        finally:
+            response.close()
+            response.release_conn()
+
+    if filename.lower().endswith(".parquet"):
+        return pq.read_schema(f"input-data/{filename}", filesystem=get_arrow_filesystem()).names
+
+    return None
+
+
+# pd.read_json's convert_dates: which columns it tries, the epoch units it tries, and
+# the cutoff (1971 in seconds) below which numbers are not taken as timestamps
+JSON_DATE_UNITS = ("s", "ms", "us", "ns")
+JSON_MIN_STAMP = 31_536_000
+
+
+def is_date_column(name) -> bool:
+    """Match the column names pd.read_json converts to datetimes by default"""
+    if not isinstance(name, str):
+        return False
+    name = name.lower()
+    return name.endswith(("_at", "_time")) or name.startswith("timestamp") or name in ("modified", "date", "datetime")
+
+
+def convert_json_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse date-like columns as pd.read_json does, leaving those that don't parse untouched"""
+    for col in df.columns:
+        values = df[col]
+        if not is_date_column(col) or not len(values) or values.dtype.kind in "bM":
+            continue
+        if values.dtype.kind == "O" or values.dtype == "string":
+            try:
+                values = values.astype("int64")
+            except OverflowError:
+                continue
+            except (TypeError, ValueError):
+                pass
+        if values.dtype.kind in "iuf":
+            if (values.dropna() <= JSON_MIN_STAMP).any():
+                continue
+            # The first unit whose dates fit in nanoseconds wins
+            for unit in JSON_DATE_UNITS:
+                try:
+                    parsed = pd.to_datetime(values, unit=unit)
+                    parsed.dt.as_unit("ns")
+                    df[col] = parsed
+                    break
+                except (ValueError, TypeError, OverflowError):
+                    continue
+        else:
+            with warnings.catch_warnings():
+                # to_datetime warns about format inference on strings that aren't dates
+                warnings.simplefilter("ignore", UserWarning)
+                for date_format in (None, "iso8601", "mixed"):
+                    try:
+                        df[col] = pd.to_datetime(values, format=date_format)
+                        break
+                    except (ValueError, TypeError, OverflowError):
+                        continue
+    return df
+
+
+def load_dataset(filename: str, source, engine: str = "pyarrow", columns=None, nrows=None,
+                 encoding=None) -> pd.DataFrame:
+    """Load dataset from a file-like object with robust error handling"""
     try:
         if filename.lower().endswith(".json"):
+            # JSON parsing needs the whole document, buffer it once
+            raw = source.read()
             try:
-                return pd.read_json(io.BytesIO(raw))
+                df = pd.DataFrame(orjson.loads(raw))
             except ValueError:
-                # Handle JSON lines format
-                return pd.read_json(io.BytesIO(raw), lines=True)
+                # Handle JSON lines format; Arrow's reader is multithreaded and
+                # ArrowInvalid propagates so the caller can retry with pandas
+                if engine == "pyarrow":
+                    df = pajson.read_json(pa.BufferReader(raw)).to_pandas()
+                else:
+                    df = pd.read_json(io.BytesIO(raw), lines=True)
+            if columns is not None:
+                df = df[columns]
+            return convert_json_dates(df if nrows is None else df.head(nrows))
 
         if filename.lower().endswith((".csv", ".tsv")):
-            for sep in [",", "\t", ";", "|"]:
-                try:
-                    df = pd.read_csv(io.BytesIO(raw), sep=sep, encoding='utf-8')
-                    if len(df.columns) > 1:
-                        return df
-                except Exception:
-                    continue
-            # Try with different encodings
-            for encoding in ['latin-1', 'iso-8859-1']:
-                try:
-                    return pd.read_csv(io.BytesIO(raw), encoding=encoding)
-                except Exception:
-                    continue
-            raise ValueError("Could not parse CSV with any delimiter or encoding")
+            # Parse straight off the stream, the delimiter is sniffed up front
+            # because a consumed stream cannot be re-read for another attempt
+            stream = io.BufferedReader(source, buffer_size=CSV_SNIFF_BYTES)
+            sep, sniffed_encoding = sniff_csv_format(stream)
+            encoding = encoding or sniffed_encoding
+            # Both parsers use the header names offered for selection, blank and duplicate ones included
+            names = csv_header(stream.peek(CSV_SNIFF_BYTES), sep, encoding)
+            if engine == "pyarrow" and nrows is None:
+                # Multithreaded Arrow parser; ArrowInvalid propagates so the caller can retry with pandas
+                table = pacsv.read_csv(
+                    stream,
+                    read_options=pacsv.ReadOptions(encoding=encoding, column_names=names, skip_rows=1),
+                    parse_options=pacsv.ParseOptions(delimiter=sep),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=columns,
+                        null_values=CSV_NULL_VALUES,
+                        strings_can_be_null=True
+                    )
+                )
+                if encoding == "utf-8" and any(pa.types.is_binary(t) for t in table.schema.types):
+                    # Arrow keeps invalid UTF-8 as binary instead of failing; signal a latin-1 re-read
+                    raise UnicodeDecodeError(encoding, b"", 0, 1, "invalid UTF-8 after the sniffed sample")
+                return table.to_pandas()
+            # With nrows, pandas stops parsing and reading the stream after that many rows
+            usecols = None if columns is None else [names.index(col) for col in columns]
+            df = pd.read_csv(stream, sep=sep, encoding=encoding, usecols=usecols, nrows=nrows)
+            return df if columns is None else df[columns]
+
+        if filename.lower().endswith(".parquet"):
+            if nrows is not None:
+                # Only the first record batch is decoded, from the first row group
+                batches = pq.ParquetFile(source).iter_batches(batch_size=nrows, columns=columns)
+                return next(batches).to_pandas()
+            return pd.read_parquet(source, engine="pyarrow", columns=columns)
 
         raise ValueError(f"Unsupported file format: {filename}")
+    except (pa.ArrowInvalid, UnicodeDecodeError):
+        raise
     except Exception as e:
         raise ValueError(f"Failed to load dataset: {str(e)}")
 
 
+def compact(df):
+    """Shrink a DataFrame in place by downcasting numbers and categorizing repetitive text"""
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    for col in df.select_dtypes(include="float").columns:
+        # Only keep float32 when it round-trips exactly, so displayed statistics don't drift
+        downcast = df[col].astype("float32")
+        if downcast.astype(df[col].dtype).equals(df[col]):
+            df[col] = downcast
+
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        try:
+            if len(df) > 0 and df[col].nunique() / len(df) < 0.5:
+                df[col] = df[col].astype("category")
+        except TypeError:
+            # Unhashable values (lists, dicts) cannot become categories
+            continue
+
+    return df
+
+
 def safe_nunique(series):
     """Calculate unique values safely, handling unhashable types"""
     try:
@@ -92,24 +275,105 @@ def safe_nunique(series):
             return "N/A"
 
 
-def get_column_info(df):
-    """Get comprehensive column information with error handling"""
-    info = []
-    for col in df.columns:
-        col_data = {
-            "Column": col,
-            "Type": str(df[col].dtype),
-            "Unique": safe_nunique(df[col]),
-            "Missing": int(df[col].isnull().sum()),
-            "Missing %": f"{(df[col].isnull().sum() / len(df) * 100):.1f}%"
-        }
-        info.append(col_data)
-    return pd.DataFrame(info)
+# Dataset-derived helpers are cached per (filename, etag, columns) key; the leading
+# underscore keeps Streamlit from hashing the whole DataFrame on every rerun
+@st.cache_data
+def get_column_info(_df, dataset_key, _null_counts):
+    """Get comprehensive column information with one frame-wide pass per statistic"""
+    try:
+        unique = _df.nunique()
+    except TypeError:
+        # Fall back to per-column handling only when unhashable types are present
+        unique = _df.apply(safe_nunique)
+
+    return pd.DataFrame({
+        "Column": _df.columns,
+        "Type": _df.dtypes.astype(str).values,
+        "Unique": unique.values,
+        "Missing": _null_counts.values.astype(int),
+        "Missing %": (_null_counts / len(_df) * 100).map("{:.1f}%".format).values
+    })
+
+
+@st.cache_data
+def count_missing(_df, dataset_key):
+    """Count missing values per column"""
+    return _df.isnull().sum()
+
+
+@st.cache_data
+def count_duplicates(_df, dataset_key):
+    """Count duplicate rows, returning (count, approximate) or None if not computable"""
+    try:
+        return int(_df.duplicated().sum()), False
+    except (TypeError, ValueError):
+        # Handle unhashable types by folding per-column 64-bit hashes into one hash per row,
+        # so at most one column is stringified at a time instead of the whole frame
+        try:
+            row_hash = np.zeros(len(_df), dtype=np.uint64)
+            for col in _df.columns:
+                try:
+                    col_hash = pd.util.hash_pandas_object(_df[col], index=False)
+                except (TypeError, ValueError):
+                    col_hash = pd.util.hash_pandas_object(_df[col].astype(str), index=False)
+                row_hash = row_hash * np.uint64(31) + col_hash.to_numpy()
+            return int(pd.Series(row_hash).duplicated().sum()), True
+        except Exception:
+            return None
+
+
+@st.cache_data
+def get_plot_data(_df, dataset_key, column):
+    """Sample a numeric column and bin it, returning (values, histogram) for the charts"""
+    # Remove NaN values for plotting, and plot a uniform sample of large columns
+    clean_data = _df[column].dropna()
+    if len(clean_data) > PLOT_SAMPLE_SIZE:
+        clean_data = clean_data.sample(PLOT_SAMPLE_SIZE, random_state=0)
 
+    values = clean_data.to_numpy(dtype=float)
+    if len(values) == 0:
+        return values, None
 
-def is_numeric_safe(series):
-    """Check if column is numeric, handling edge cases"""
-    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    # Bin server-side so only the bar counts are sent to the browser
+    counts, edges = np.histogram(values, bins=min(30, clean_data.nunique()))
+    return values, pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": counts})
+
+
+def prune_disk_cache():
+    """Delete the least recently written persisted cache entries until they fit DISK_CACHE_MAX_BYTES"""
+    try:
+        entries = [entry for entry in os.scandir(DISK_CACHE_DIR) if entry.name.endswith(".memo")]
+    except FileNotFoundError:
+        return
+    # Another session's prune or a cache clear can remove entries while we look at them
+    stats = []
+    for entry in entries:
+        try:
+            stats.append((entry.stat(), entry.path))
+        except FileNotFoundError:
+            continue
+    stats.sort(key=lambda item: item[0].st_mtime, reverse=True)
+    total = 0
+    for stat, path in stats:
+        total += stat.st_size
+        if total > DISK_CACHE_MAX_BYTES:
+            # A pruned entry only costs a reload; the in-memory copy is unaffected
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+@st.cache_data(ttl=30)
+def list_input_files():
+    """Map dataset names in the input bucket to their ETags"""
+    objects = client.list_objects("input-data", recursive=True)
+    return {obj.object_name: obj.etag for obj in sorted(objects, key=lambda obj: obj.object_name)}
+
+
+def numeric_columns(df):
+    """List numeric columns, excluding booleans and durations"""
+    return df.select_dtypes(include="number", exclude=["bool", "timedelta"]).columns.tolist()
 
 
 # ------------------ UI ------------------
@@ -124,19 +388,38 @@ with st.sidebar:
         st.error("Input bucket `input-data` does not exist.")
         st.stop()
 
-    objects = list(client.list_objects("input-data", recursive=True))
+    file_names = list_input_files()
 
-    if not objects:
+    if not file_names:
         st.warning("No datasets uploaded yet.")
         st.stop()
 
-    file_names = sorted([obj.object_name for obj in objects])
-
     selected_file = st.selectbox(
         "Select dataset to analyze",
-        file_names,
+        list(file_names),
         index=0
     )
+    selected_etag = file_names[selected_file]
+
+    try:
+        header = read_header(selected_file, selected_etag)
+    except Exception as e:
+        st.error(f"❌ Failed to read dataset columns: {e}")
+        st.stop()
+
+    if header:
+        chosen = st.multiselect(
+            "Columns to load",
+            header,
+            default=header[:DEFAULT_COLUMN_COUNT]
+        )
+        if not chosen:
+            st.warning("Select at least one column.")
+            st.stop()
+        # Keep file order so the cache key doesn't depend on click order
+        selected_columns = tuple(col for col in header if col in chosen)
+    else:
+        selected_columns = None
 
     if st.button("🔄 Refresh Data", use_container_width=True):
         st.cache_data.clear()
@@ -144,166 +427,207 @@ with st.sidebar:
 
 
 # ------------------ LOAD DATA ------------------
-@st.cache_data
-def load_cached_data(filename):
-    raw = client.get_object("input-data", filename).read()
-    return load_dataset(filename, raw)
-
-
-try:
-    with st.spinner("Loading dataset..."):
-        df = load_cached_data(selected_file)
-except Exception as e:
-    st.error(f"❌ Failed to load dataset: {e}")
-    st.stop()
+def fetch_and_load(filename, engine, columns, nrows=None, encoding=None):
+    if filename.lower().endswith(".parquet"):
+        with get_arrow_filesystem().open_input_file(f"input-data/{filename}") as source:
+            return load_dataset(filename, source, engine, columns, nrows)
 
-# ------------------ OVERVIEW METRICS ------------------
-st.header("📈 Dataset Overview")
+    response = client.get_object("input-data", filename)
+    try:
+        return load_dataset(filename, response, engine, columns, nrows, encoding)
+    finally:
+        response.close()
+        response.release_conn()
 
-col1, col2, col3, col4 = st.columns(4)
 
-with col1:
-    st.metric("Total Rows", f"{len(df):,}")
+def read_input(filename, engine, columns, nrows=None):
+    try:
+        return fetch_and_load(filename, engine, columns, nrows)
+    except UnicodeDecodeError:
+        # Non-UTF-8 bytes past the sniffed sample; the stream is spent, so fetch it again as latin-1
+        return fetch_and_load(filename, engine, columns, nrows, encoding="latin-1")
+
+
+# Persisted to disk so restarts skip the download and reparse; the ETag from the
+# bucket listing is part of the key, so a replaced object is never served stale
+@st.cache_data(persist="disk", max_entries=32)
+def load_cached_data(filename, etag, columns):
+    columns = list(columns) if columns is not None else None
+    # Compact before returning so the cached copy is the small one
+    try:
+        return compact(read_input(filename, "pyarrow", columns))
+    except pa.ArrowInvalid:
+        # Arrow rejects ragged rows and mid-file type changes that pandas tolerates
+        return compact(read_input(filename, "pandas", columns))
 
-with col2:
-    st.metric("Total Columns", len(df.columns))
 
-with col3:
-    numeric_count = sum(is_numeric_safe(df[col]) for col in df.columns)
-    st.metric("Numeric Columns", numeric_count)
+@st.cache_data(persist="disk", max_entries=32)
+def load_cached_preview(filename, etag, columns):
+    if filename.lower().endswith(".json"):
+        # JSON has no partial read; reuse the full load instead of parsing and caching it twice
+        return load_cached_data(filename, etag, columns).head(PREVIEW_MAX_ROWS)
+    columns = list(columns) if columns is not None else None
+    return read_input(filename, "pandas", columns, nrows=PREVIEW_MAX_ROWS)
 
-with col4:
-    total_missing = df.isnull().sum().sum()
-    st.metric("Total Missing Values", f"{total_missing:,}")
-
-st.markdown("---")
 
 # ------------------ PREVIEW ------------------
 st.header("📋 Data Preview")
 st.caption(f"Showing dataset: **{selected_file}**")
 
-preview_rows = st.slider("Number of rows to preview", 5, min(100, len(df)), 10)
-st.dataframe(df.head(preview_rows), use_container_width=True, height=400)
+try:
+    preview = load_cached_preview(selected_file, selected_etag, selected_columns)
+except Exception as e:
+    st.error(f"❌ Failed to load dataset: {e}")
+    st.stop()
+prune_disk_cache()
+
+preview_rows = st.slider("Number of rows to preview", 5, min(PREVIEW_MAX_ROWS, len(preview)), 10)
+st.dataframe(preview.head(preview_rows), use_container_width=True, height=400)
 
 st.markdown("---")
 
-# ------------------ DETAILED SCHEMA ------------------
-st.header("🧱 Schema & Data Quality")
-
-schema_info = get_column_info(df)
-
-tab1, tab2 = st.tabs(["📊 Column Details", "🔍 Data Quality Report"])
-
-with tab1:
-    st.dataframe(
-        schema_info,
-        use_container_width=True,
-        height=400,
-        column_config={
-            "Column": st.column_config.TextColumn("Column Name", width="medium"),
-            "Type": st.column_config.TextColumn("Data Type", width="small"),
-            "Unique": st.column_config.NumberColumn("Unique Values", format="%d"),
-            "Missing": st.column_config.NumberColumn("Missing Count", format="%d"),
-            "Missing %": st.column_config.TextColumn("Missing %", width="small")
-        }
-    )
+# ------------------ FULL ANALYTICS ------------------
+# The full parse only runs once requested, the preview above reads just the first rows
+if st.toggle("📊 Show full analytics", value=False):
+    try:
+        with st.spinner("Loading dataset..."):
+            df = load_cached_data(selected_file, selected_etag, selected_columns)
+    except Exception as e:
+        st.error(f"❌ Failed to load dataset: {e}")
+        st.stop()
+    prune_disk_cache()
 
-with tab2:
-    col1, col2 = st.columns(2)
+    dataset_key = (selected_file, selected_etag, selected_columns)
+    numeric_cols = numeric_columns(df)
+    null_counts = count_missing(df, dataset_key)
 
-    with col1:
-        st.subheader("Missing Values Analysis")
-        missing_data = schema_info[schema_info["Missing"] > 0].sort_values("Missing", ascending=False)
+    # ------------------ OVERVIEW METRICS ------------------
+    st.header("📈 Dataset Overview")
 
-        if len(missing_data) > 0:
-            st.dataframe(missing_data[["Column", "Missing", "Missing %"]], use_container_width=True)
-        else:
-            st.success("✅ No missing values detected!")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Rows", f"{len(df):,}")
 
     with col2:
-        st.subheader("Duplicate Rows")
+        st.metric("Total Columns", len(df.columns))
 
-        try:
-            dup_count = int(df.duplicated().sum())
+    with col3:
+        st.metric("Numeric Columns", len(numeric_cols))
 
-            if dup_count > 0:
-                st.warning(f"⚠️ Found {dup_count:,} duplicate rows ({dup_count / len(df) * 100:.1f}%)")
-            else:
-                st.success("✅ No duplicate rows detected!")
-        except (TypeError, ValueError):
-            # Handle unhashable types by converting to string
-            try:
-                df_str = df.astype(str)
-                dup_count = int(df_str.duplicated().sum())
+    with col4:
+        total_missing = null_counts.sum()
+        st.metric("Total Missing Values", f"{total_missing:,}")
 
-                if dup_count > 0:
-                    st.warning(f"⚠️ Found ~{dup_count:,} duplicate rows ({dup_count / len(df) * 100:.1f}%)")
-                    st.caption("(Approximate due to complex data types)")
-                else:
-                    st.success("✅ No duplicate rows detected!")
-            except Exception as e:
-                st.info("ℹ️ Duplicate detection not available for this dataset (contains complex nested data)")
+    st.markdown("---")
 
-st.markdown("---")
+    # ------------------ DETAILED SCHEMA ------------------
+    st.header("🧱 Schema & Data Quality")
 
-# ------------------ NUMERIC ANALYTICS ------------------
-numeric_cols = [col for col in df.columns if is_numeric_safe(df[col])]
+    schema_info = get_column_info(df, dataset_key, null_counts)
 
-if numeric_cols:
-    st.header("🔢 Numeric Analytics")
+    tab1, tab2 = st.tabs(["📊 Column Details", "🔍 Data Quality Report"])
 
-    metric_col = st.selectbox(
-        "Select numeric column for analysis",
-        numeric_cols,
-        index=0
-    )
+    with tab1:
+        st.dataframe(
+            schema_info,
+            use_container_width=True,
+            height=400,
+            column_config={
+                "Column": st.column_config.TextColumn("Column Name", width="medium"),
+                "Type": st.column_config.TextColumn("Data Type", width="small"),
+                "Unique": st.column_config.NumberColumn("Unique Values", format="%d"),
+                "Missing": st.column_config.NumberColumn("Missing Count", format="%d"),
+                "Missing %": st.column_config.TextColumn("Missing %", width="small")
+            }
+        )
 
-    col1, col2, col3 = st.columns([1, 1, 1])
+    with tab2:
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.subheader("Descriptive Statistics")
-        stats_df = df[metric_col].describe().to_frame()
-        stats_df.columns = ["Value"]
-        st.dataframe(stats_df, use_container_width=True)
+        with col1:
+            st.subheader("Missing Values Analysis")
+            missing_data = schema_info[schema_info["Missing"] > 0].sort_values("Missing", ascending=False)
 
-    with col2:
-        st.subheader("Distribution")
-        fig, ax = plt.subplots(figsize=(8, 5))
-
-        # Remove NaN values for plotting
-        clean_data = df[metric_col].dropna()
-
-        if len(clean_data) > 0:
-            ax.hist(clean_data, bins=min(30, len(clean_data.unique())),
-                    color='#1f77b4', alpha=0.7, edgecolor='black')
-            ax.set_xlabel(metric_col, fontsize=12)
-            ax.set_ylabel("Frequency", fontsize=12)
-            ax.set_title(f"Distribution of {metric_col}", fontsize=14, fontweight='bold')
-            ax.grid(axis='y', alpha=0.3)
-            st.pyplot(fig)
-        else:
-            st.warning("No valid data to plot")
+            if len(missing_data) > 0:
+                st.dataframe(missing_data[["Column", "Missing", "Missing %"]], use_container_width=True)
+            else:
+                st.success("✅ No missing values detected!")
 
-    with col3:
-        st.subheader("Boxplot")
-        fig, ax = plt.subplots(figsize=(8, 5))
-
-        clean_data = df[metric_col].dropna()
-
-        if len(clean_data) > 0:
-            ax.boxplot(clean_data, vert=False, patch_artist=True,
-                       boxprops=dict(facecolor='#ff7f0e', alpha=0.7),
-                       medianprops=dict(color='red', linewidth=2))
-            ax.set_xlabel(metric_col, fontsize=12)
-            ax.set_title(f"Boxplot of {metric_col}", fontsize=14, fontweight='bold')
-            ax.grid(axis='x', alpha=0.3)
-            st.pyplot(fig)
-        else:
-            st.warning("No valid data to plot")
+        with col2:
+            st.subheader("Duplicate Rows")
+
+            duplicates = count_duplicates(df, dataset_key)
+
+            if duplicates is None:
+                st.info("ℹ️ Duplicate detection not available for this dataset (contains complex nested data)")
+            else:
+                dup_count, approximate = duplicates
+
+                if dup_count > 0:
+                    prefix = "~" if approximate else ""
+                    st.warning(f"⚠️ Found {prefix}{dup_count:,} duplicate rows ({dup_count / len(df) * 100:.1f}%)")
+                    if approximate:
+                        st.caption("(Approximate due to complex data types)")
+                else:
+                    st.success("✅ No duplicate rows detected!")
 
     st.markdown("---")
-else:
-    st.info("ℹ️ No numeric columns available for analysis")
+
+    # ------------------ NUMERIC ANALYTICS ------------------
+    if numeric_cols:
+        st.header("🔢 Numeric Analytics")
+
+        metric_col = st.selectbox(
+            "Select numeric column for analysis",
+            numeric_cols,
+            index=0
+        )
+
+        # Cached per column, so unrelated widget changes don't re-sample and re-bin
+        plot_values, hist_df = get_plot_data(df, dataset_key, metric_col)
+
+        col1, col2, col3 = st.columns([1, 1, 1])
+
+        with col1:
+            st.subheader("Descriptive Statistics")
+            stats_df = df[metric_col].describe().to_frame()
+            stats_df.columns = ["Value"]
+            st.dataframe(stats_df, use_container_width=True)
+
+        with col2:
+            st.subheader("Distribution")
+
+            if hist_df is not None:
+                chart = alt.Chart(hist_df, title=f"Distribution of {metric_col}").mark_bar(
+                    color='#1f77b4', opacity=0.7, stroke='black'
+                ).encode(
+                    x=alt.X("start:Q", title=metric_col),
+                    x2="end:Q",
+                    y=alt.Y("count:Q", title="Frequency")
+                )
+                st.altair_chart(chart, use_container_width=True)
+            else:
+                st.warning("No valid data to plot")
+
+        with col3:
+            st.subheader("Boxplot")
+
+            if len(plot_values) > 0:
+                # A fixed field name avoids Altair parsing dots or colons in column names
+                chart = alt.Chart(pd.DataFrame({"value": plot_values}),
+                                  title=f"Boxplot of {metric_col}").mark_boxplot(
+                    color='#ff7f0e', median={"color": "red"}
+                ).encode(
+                    x=alt.X("value:Q", title=metric_col)
+                )
+                st.altair_chart(chart, use_container_width=True)
+            else:
+                st.warning("No valid data to plot")
+
+        st.markdown("---")
+    else:
+        st.info("ℹ️ No numeric columns available for analysis")
 
 # ------------------ BATCH OUTPUT ------------------
 st.header("📈 Batch Analytics Output")
@@ -311,7 +635,7 @@ st.header("📈 Batch Analytics Output")
 if client.bucket_exists("batch-data"):
     try:
         obj = client.get_object("batch-data", "analytics_report.json")
-        report = json.loads(obj.read())
+        report = orjson.loads(obj.read())
         st.json(report, expanded=True)
     except Exception:
         st.info("ℹ️ Batch analytics not generated for this dataset yet.")
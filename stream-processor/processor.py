@@ -1,15 +1,22 @@
 from kafka import KafkaConsumer
 from minio import Minio
 import os
+import io
+import time
 
 KAFKA_TOPIC = "events"
 KAFKA_BOOTSTRAP = "kafka:9092"
+KAFKA_GROUP_ID = os.getenv("KAFKA_GROUP_ID", "stream-processor")
 
 MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "minio:9000")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "minioadmin")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "minioadmin")
 BUCKET = "stream-data"
 
+POLL_MAX_RECORDS = 5000
+FLUSH_BYTES = 8 * 1024 * 1024
+FLUSH_INTERVAL_SECONDS = 5
+
 minio_client = Minio(
     MINIO_ENDPOINT,
     access_key=MINIO_ACCESS_KEY,
@@ -23,19 +30,59 @@ if not minio_client.bucket_exists(BUCKET):
 consumer = KafkaConsumer(
     KAFKA_TOPIC,
     bootstrap_servers=KAFKA_BOOTSTRAP,
+    group_id=KAFKA_GROUP_ID,
     auto_offset_reset="earliest",
-    enable_auto_commit=True
+    enable_auto_commit=False
 )
 
-for message in consumer:
-    content = message.value.decode()
-    object_name = f"event-{message.offset}.txt"
+# Pending newline-delimited batches per partition, since offsets are only unique within one
+batches = {}
+batch_started = None
+
+
+def flush():
+    for partition, batch in batches.items():
+        object_name = f"events-{partition}-{batch['first_offset']}-{batch['last_offset']}.ndjson"
+        buffer = batch["buffer"]
+        buffer.seek(0)
+
+        minio_client.put_object(
+            BUCKET,
+            object_name,
+            buffer,
+            length=buffer.getbuffer().nbytes,
+            content_type="application/x-ndjson"
+        )
+
+        print(f"Processed messages {batch['first_offset']}-{batch['last_offset']} from partition {partition}")
+
+    batches.clear()
+    # Commit offsets only after every batch is stored, so a crash replays instead of losing events
+    consumer.commit()
+
+
+while True:
+    records = consumer.poll(timeout_ms=1000, max_records=POLL_MAX_RECORDS)
+
+    for topic_partition, messages in records.items():
+        for message in messages:
+            batch = batches.get(topic_partition.partition)
+            if batch is None:
+                batch = batches[topic_partition.partition] = {
+                    "buffer": io.BytesIO(),
+                    "first_offset": message.offset,
+                    "last_offset": message.offset
+                }
+            batch["buffer"].write(message.value.rstrip(b"\n") + b"\n")
+            batch["last_offset"] = message.offset
+
+    if not batches:
+        continue
 
-    minio_client.put_object(
-        BUCKET,
-        object_name,
-        content.encode(),
-        length=len(content)
-    )
+    if batch_started is None:
+        batch_started = time.monotonic()
 
-    print(f"Processed message {message.offset}")
+    buffered = sum(batch["buffer"].tell() for batch in batches.values())
+    if buffered >= FLUSH_BYTES or time.monotonic() - batch_started >= FLUSH_INTERVAL_SECONDS:
+        flush()
+        batch_started = None